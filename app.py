@@ -8,8 +8,16 @@ import os
 import json
 import hashlib
 import hmac
+import math
+import threading
+import time
+import tracemalloc
+import unicodedata
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta
 from functools import wraps
+import click
+import numpy as np
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for
 from flask_mysqldb import MySQL
 import MySQLdb.cursors
@@ -60,7 +68,7 @@ def permissao_requerida(permissoes_permitidas):
     return decorator
 
 def registrar_auditoria(id_usuario, operacao, tabela, valor_anterior=None, valor_novo=None, ip=''):
-    """Registra operação em auditoria"""
+    """Registra operação em auditoria e retorna o id_log (None em caso de erro)"""
     try:
         cursor = mysql.connection.cursor()
         cursor.execute("""
@@ -68,9 +76,12 @@ def registrar_auditoria(id_usuario, operacao, tabela, valor_anterior=None, valor
             VALUES (%s, %s, %s, %s, %s, %s)
         """, (id_usuario, operacao, tabela, valor_anterior, valor_novo, ip))
         mysql.connection.commit()
+        id_log = cursor.lastrowid
         cursor.close()
+        return id_log
     except Exception as e:
         print(f"Erro ao registrar auditoria: {e}")
+        return None
 
 # ============================================================
 # ROTAS DE AUTENTICAÇÃO
@@ -151,6 +162,214 @@ def dashboard():
                          total_clientes=total_clientes,
                          produtos_baixos=produtos_baixos)
 
+# ============================================================
+# ÍNDICE DE BUSCA DE CLIENTES (TYPEAHEAD)
+# ============================================================
+
+BUSCA_LIMITE_PADRAO = 10
+BUSCA_LIMITE_MAXIMO = 50
+BUSCA_INTERVALO_VERSAO = 5  # segundos entre verificações de versão no banco
+
+def normalizar_texto(texto):
+    """Remove acentos, caixa e espaços repetidos para comparação por prefixo"""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    sem_acentos = ''.join(ch for ch in decomposto if not unicodedata.combining(ch))
+    return ' '.join(sem_acentos.casefold().split())
+
+class IndiceClientes:
+    """Índice em memória (por worker) de clientes ativos por prefixo de nome e CPF.
+
+    Mantém listas ordenadas de (chave, id_cliente) pesquisadas com bisect.
+    A versão é o último id_log de clientes em audit_log: quando outro worker
+    altera clientes, a versão muda e o índice é recarregado em segundo plano,
+    enquanto as buscas continuam usando o snapshot atual. Escritas do próprio
+    worker avançam a versão para o seu id_log, sem provocar recarga, desde que
+    todos os id_log anteriores já estejam visíveis: como o auto-incremento é
+    alocado no INSERT e não no COMMIT, uma lacuna pode ser uma auditoria ainda
+    não confirmada de outro worker, e nesse caso a versão não avança e a
+    verificação periódica recarrega o índice.
+
+    A carga inicial também roda em segundo plano (iniciar); até terminar, as
+    buscas do worker retornam vazio em vez de aguardar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recarga_lock = threading.Lock()
+        self._geracao = 0  # incrementada a cada recarga completa
+        self._clientes = {}
+        self._nomes = []       # nome completo normalizado
+        self._sobrenomes = []  # nome a partir da segunda palavra
+        self._cpfs = []
+        self.versao = None
+        self._verificado_em = 0.0
+
+    @staticmethod
+    def _chaves_nome(nome):
+        palavras = normalizar_texto(nome).split()
+        return [' '.join(palavras[i:]) for i in range(len(palavras))]
+
+    @staticmethod
+    def _remover_chave(lista, chave):
+        i = bisect_left(lista, chave)
+        if i < len(lista) and lista[i] == chave:
+            del lista[i]
+
+    @staticmethod
+    def _versao_atual(cursor):
+        cursor.execute("""
+            SELECT MAX(id_log) as versao FROM audit_log WHERE tabela_afetada = 'clientes'
+        """)
+        return cursor.fetchone()['versao'] or 0
+
+    def _inserir(self, cliente):
+        id_cliente = cliente['id_cliente']
+        self._clientes[id_cliente] = cliente
+        chaves = self._chaves_nome(cliente['nome'])
+        if chaves:
+            insort(self._nomes, (chaves[0], id_cliente))
+        for chave in chaves[1:]:
+            insort(self._sobrenomes, (chave, id_cliente))
+        insort(self._cpfs, (cliente['cpf'], id_cliente))
+
+    def _retirar(self, id_cliente):
+        cliente = self._clientes.pop(id_cliente, None)
+        if not cliente:
+            return
+        chaves = self._chaves_nome(cliente['nome'])
+        if chaves:
+            self._remover_chave(self._nomes, (chaves[0], id_cliente))
+        for chave in chaves[1:]:
+            self._remover_chave(self._sobrenomes, (chave, id_cliente))
+        self._remover_chave(self._cpfs, (cliente['cpf'], id_cliente))
+
+    def carregar(self):
+        """Reconstrói o índice a partir da tabela clientes"""
+        cursor = mysql.connection.cursor()
+        # Versão lida antes dos dados: alterações durante a carga geram nova recarga
+        versao = self._versao_atual(cursor)
+        cursor.execute("""
+            SELECT id_cliente, nome, cpf, email, telefone
+            FROM clientes WHERE status = "ATIVO"
+        """)
+        linhas = cursor.fetchall()
+        cursor.close()
+
+        clientes, nomes, sobrenomes, cpfs = {}, [], [], []
+        for cliente in linhas:
+            id_cliente = cliente['id_cliente']
+            clientes[id_cliente] = cliente
+            chaves = self._chaves_nome(cliente['nome'])
+            if chaves:
+                nomes.append((chaves[0], id_cliente))
+            sobrenomes.extend((chave, id_cliente) for chave in chaves[1:])
+            cpfs.append((cliente['cpf'], id_cliente))
+        nomes.sort()
+        sobrenomes.sort()
+        cpfs.sort()
+
+        with self._lock:
+            self._clientes, self._nomes, self._sobrenomes, self._cpfs = clientes, nomes, sobrenomes, cpfs
+            self.versao = versao
+            self._geracao += 1
+            self._verificado_em = time.monotonic()
+
+    def _recarregar(self):
+        """Recarga em segundo plano; libera o _recarga_lock adquirido por sincronizar"""
+        try:
+            with app.app_context():
+                self.carregar()
+        except Exception as e:
+            print(f"Erro ao recarregar índice de clientes: {e}")
+        finally:
+            self._recarga_lock.release()
+
+    def iniciar(self):
+        """Inicia a carga do índice em segundo plano, se nenhuma estiver em andamento"""
+        if self._recarga_lock.acquire(blocking=False):
+            threading.Thread(target=self._recarregar, daemon=True).start()
+
+    def sincronizar(self):
+        """Garante o índice carregado e agenda recarga se a versão no banco mudou"""
+        if self.versao is None:
+            # Worker ainda sem índice: carrega em segundo plano sem bloquear a busca
+            self.iniciar()
+            return
+
+        with self._lock:
+            agora = time.monotonic()
+            if agora - self._verificado_em < BUSCA_INTERVALO_VERSAO:
+                return
+            self._verificado_em = agora
+
+        cursor = mysql.connection.cursor()
+        versao = self._versao_atual(cursor)
+        cursor.close()
+
+        if versao != self.versao:
+            self.iniciar()
+
+    def _avancar_versao(self, versao, geracao, id_log):
+        """Avança a versão para o id_log da escrita local se todos os id_log
+        intermediários estão visíveis e nenhum deles altera clientes"""
+        if id_log is None or versao is None:
+            return
+        cursor = mysql.connection.cursor()
+        cursor.execute("""
+            SELECT COUNT(*) as visiveis, SUM(tabela_afetada = 'clientes') as clientes
+            FROM audit_log WHERE id_log > %s AND id_log < %s
+        """, (versao, id_log))
+        resultado = cursor.fetchone()
+        cursor.close()
+
+        sem_lacunas = resultado['visiveis'] == id_log - versao - 1
+        with self._lock:
+            if (sem_lacunas and not resultado['clientes']
+                    and self.versao == versao and self._geracao == geracao):
+                self.versao = id_log
+
+    def adicionar(self, cliente, id_log=None):
+        """Inclui ou substitui um cliente no índice; id_log é a auditoria da escrita"""
+        with self._lock:
+            self._retirar(cliente['id_cliente'])
+            self._inserir(cliente)
+            versao, geracao = self.versao, self._geracao
+        self._avancar_versao(versao, geracao, id_log)
+
+    def remover(self, id_cliente, id_log=None):
+        """Remove um cliente do índice; id_log é a auditoria da escrita"""
+        with self._lock:
+            self._retirar(id_cliente)
+            versao, geracao = self.versao, self._geracao
+        self._avancar_versao(versao, geracao, id_log)
+
+    def _coletar(self, lista, prefixo, encontrados, limite):
+        i = bisect_left(lista, (prefixo,))
+        while i < len(lista) and len(encontrados) < limite:
+            chave, id_cliente = lista[i]
+            if not chave.startswith(prefixo):
+                break
+            if id_cliente not in encontrados:
+                encontrados.append(id_cliente)
+            i += 1
+
+    def buscar(self, termo, limite=BUSCA_LIMITE_PADRAO):
+        """Retorna até `limite` clientes cujo nome ou CPF começa com o termo"""
+        termo = normalizar_texto(termo)
+        digitos = ''.join(ch for ch in termo if ch.isdigit())
+        encontrados = []
+
+        with self._lock:
+            if digitos and not any(ch.isalpha() for ch in termo):
+                self._coletar(self._cpfs, digitos, encontrados, limite)
+            elif termo:
+                # Início do nome tem prioridade sobre sobrenomes
+                self._coletar(self._nomes, termo, encontrados, limite)
+                self._coletar(self._sobrenomes, termo, encontrados, limite)
+            return [self._clientes[id_cliente] for id_cliente in encontrados]
+
+indice_clientes = IndiceClientes()
+
 # ============================================================
 # ROTAS DE CLIENTES
 # ============================================================
@@ -182,8 +401,12 @@ def clientes():
             id_cliente = cursor.lastrowid
             cursor.close()
             
-            registrar_auditoria(session['id_usuario'], 'INSERT', 'clientes', None,
-                              json.dumps(dados), request.remote_addr)
+            id_log = registrar_auditoria(session['id_usuario'], 'INSERT', 'clientes', None,
+                                         json.dumps(dados), request.remote_addr)
+            
+            indice_clientes.adicionar({'id_cliente': id_cliente, 'nome': dados['nome'],
+                                       'cpf': dados['cpf'], 'email': dados.get('email', ''),
+                                       'telefone': dados.get('telefone', '')}, id_log)
             
             return jsonify({'sucesso': True, 'id': id_cliente}), 201
         except MySQLdb.IntegrityError as e:
@@ -193,6 +416,20 @@ def clientes():
             cursor.close()
             return jsonify({'erro': str(e)}), 500
 
+@app.route('/api/clientes/busca')
+@login_required
+def buscar_clientes():
+    """Busca clientes ativos por prefixo de nome ou CPF (typeahead)"""
+    termo = request.args.get('q', '').strip()
+    limite = request.args.get('limite', BUSCA_LIMITE_PADRAO, type=int)
+    limite = max(1, min(limite, BUSCA_LIMITE_MAXIMO))
+    
+    if not termo:
+        return jsonify([])
+    
+    indice_clientes.sincronizar()
+    return jsonify(indice_clientes.buscar(termo, limite))
+
 @app.route('/api/clientes/<int:id_cliente>', methods=['GET', 'PUT', 'DELETE'])
 @login_required
 def cliente_detalhes(id_cliente):
@@ -227,8 +464,17 @@ def cliente_detalhes(id_cliente):
             mysql.connection.commit()
             cursor.close()
             
-            registrar_auditoria(session['id_usuario'], 'UPDATE', 'clientes',
-                              json.dumps(cliente_antigo), json.dumps(dados), request.remote_addr)
+            id_log = registrar_auditoria(session['id_usuario'], 'UPDATE', 'clientes',
+                                         json.dumps(cliente_antigo, default=str), json.dumps(dados),
+                                         request.remote_addr)
+            
+            if cliente_antigo['status'] == 'ATIVO':
+                indice_clientes.adicionar({'id_cliente': id_cliente,
+                                           'nome': dados.get('nome', cliente_antigo['nome']),
+                                           'cpf': cliente_antigo['cpf'],
+                                           'email': dados.get('email', cliente_antigo['email']),
+                                           'telefone': dados.get('telefone', cliente_antigo['telefone'])},
+                                          id_log)
             
             return jsonify({'sucesso': True})
         except Exception as e:
@@ -244,8 +490,10 @@ def cliente_detalhes(id_cliente):
             mysql.connection.commit()
             cursor.close()
             
-            registrar_auditoria(session['id_usuario'], 'DELETE', 'clientes', None,
-                              json.dumps({'id_cliente': id_cliente}), request.remote_addr)
+            id_log = registrar_auditoria(session['id_usuario'], 'DELETE', 'clientes', None,
+                                         json.dumps({'id_cliente': id_cliente}), request.remote_addr)
+            
+            indice_clientes.remover(id_cliente, id_log)
             
             return jsonify({'sucesso': True})
         except Exception as e:
@@ -670,6 +918,241 @@ def relatorio_auditoria():
     cursor.close()
     return jsonify(resultado)
 
+# ============================================================
+# CÁLCULO DE PONTOS DE REPOSIÇÃO (JOB EM LOTE)
+# ============================================================
+
+REPOSICAO_SEMANAS_MEDIA = 8       # janela da média móvel de velocidade
+REPOSICAO_SEMANAS_ANO = 52
+# Ano anterior completo mais a janela da média no mesmo período do ano passado
+REPOSICAO_SEMANAS_HISTORICO = REPOSICAO_SEMANAS_ANO + REPOSICAO_SEMANAS_MEDIA
+REPOSICAO_PRAZO_DIAS = 14         # prazo de entrega do fornecedor
+REPOSICAO_FATOR_SEGURANCA = 1.65  # ~95% de nível de serviço
+REPOSICAO_SAZONALIDADE_MAXIMA = 2.0
+REPOSICAO_LOTE_LEITURA = 50000    # linhas por fetchmany
+
+def calcular_pontos_reposicao(sku_idx, semanas, quantidades, colecao_idx, n_colecoes,
+                              prazo_dias=REPOSICAO_PRAZO_DIAS):
+    """Calcula o ponto de reposição de todos os SKUs em uma única passagem vetorizada.
+
+    sku_idx, semanas e quantidades são colunas das linhas de venda (semana 0 é a
+    mais recente); colecao_idx traz a coleção de cada SKU. Retorna a quantidade
+    mínima sugerida de cada SKU e a máscara dos SKUs com vendas na janela da
+    média.
+    """
+    if prazo_dias < 1:
+        raise ValueError('prazo_dias deve ser de pelo menos 1 dia')
+
+    n_skus = len(colecao_idx)
+    n_semanas = REPOSICAO_SEMANAS_HISTORICO
+    janela = REPOSICAO_SEMANAS_MEDIA
+
+    # Matriz SKU x semana de demanda
+    demanda = np.bincount(sku_idx * n_semanas + semanas, weights=quantidades,
+                          minlength=n_skus * n_semanas).reshape(n_skus, n_semanas)
+
+    # Velocidade diária pela média móvel das semanas recentes
+    recentes = demanda[:, :janela]
+    velocidade_diaria = recentes.mean(axis=1) / 7
+    desvio_semanal = recentes.std(axis=1)
+    com_vendas = recentes.sum(axis=1) > 0
+
+    # Sazonalidade por coleção no ano anterior: demanda das semanas do prazo
+    # sobre a demanda da mesma janela da média. Sem histórico na janela
+    # (ex.: coleção lançada há menos de um ano) o fator é neutro.
+    demanda_colecao = np.bincount(colecao_idx[sku_idx] * n_semanas + semanas, weights=quantidades,
+                                  minlength=n_colecoes * n_semanas).reshape(n_colecoes, n_semanas)
+    semanas_prazo = max(1, math.ceil(prazo_dias / 7))
+    ano = REPOSICAO_SEMANAS_ANO
+    media_prazo_ano_anterior = demanda_colecao[:, ano - semanas_prazo:ano].mean(axis=1)
+    media_janela_ano_anterior = demanda_colecao[:, ano:ano + janela].mean(axis=1)
+    sazonalidade = np.divide(media_prazo_ano_anterior, media_janela_ano_anterior,
+                             out=np.ones(n_colecoes), where=media_janela_ano_anterior > 0)
+    sazonalidade = np.minimum(sazonalidade, REPOSICAO_SAZONALIDADE_MAXIMA)
+
+    demanda_prazo = velocidade_diaria * sazonalidade[colecao_idx] * prazo_dias
+    estoque_seguranca = REPOSICAO_FATOR_SEGURANCA * desvio_semanal * np.sqrt(prazo_dias / 7)
+    pontos = np.ceil(demanda_prazo + estoque_seguranca).astype(np.int64)
+    return pontos, com_vendas
+
+def ler_colunas(cursor, n_colunas, lote=REPOSICAO_LOTE_LEITURA):
+    """Lê o resultado corrente em lotes para um array int32 (n_linhas x n_colunas)"""
+    blocos = []
+    while True:
+        linhas = cursor.fetchmany(lote)
+        if not linhas:
+            break
+        blocos.append(np.array(linhas, dtype=np.int32).reshape(-1, n_colunas))
+    if not blocos:
+        return np.empty((0, n_colunas), dtype=np.int32)
+    return np.concatenate(blocos)
+
+def carregar_vendas_colunares(cursor):
+    """Carrega catálogo e linhas de venda do histórico em arrays colunares.
+
+    Espera um cursor sem buffer (SSCursor) para que as linhas sejam lidas do
+    servidor em lotes, sem materializar o histórico como tuplas Python.
+    Também indica os SKUs novos, cadastrados dentro da janela da média.
+    """
+    cursor.execute("""
+        SELECT pv.id_variacao, p.id_colecao,
+               COALESCE(pv.data_criacao >= CURDATE() - INTERVAL %s DAY, 0)
+        FROM produto_variacao pv
+        INNER JOIN produtos p ON pv.id_produto = p.id_produto
+        ORDER BY pv.id_variacao
+    """, (REPOSICAO_SEMANAS_MEDIA * 7,))
+    catalogo = ler_colunas(cursor, 3)
+    ids_variacao = catalogo[:, 0]
+    colecoes, colecao_idx = np.unique(catalogo[:, 1], return_inverse=True)
+    novos = catalogo[:, 2].astype(bool)
+
+    cursor.execute("""
+        SELECT iv.id_variacao, DATEDIFF(CURDATE(), DATE(v.data_venda)) DIV 7, iv.quantidade
+        FROM item_venda iv
+        INNER JOIN vendas v ON iv.id_venda = v.id_venda
+        WHERE v.status = 'CONCLUIDA' AND v.data_venda >= CURDATE() - INTERVAL %s DAY
+    """, (REPOSICAO_SEMANAS_HISTORICO * 7,))
+    linhas = ler_colunas(cursor, 3)
+    linhas = linhas[(linhas[:, 1] >= 0) & (linhas[:, 1] < REPOSICAO_SEMANAS_HISTORICO)]
+
+    sku_idx = np.searchsorted(ids_variacao, linhas[:, 0])
+    return ids_variacao, colecao_idx, len(colecoes), novos, sku_idx, linhas[:, 1], linhas[:, 2]
+
+def atualizar_quantidades_minimas(cursor, ids_variacao, pontos, tabela='produto_variacao'):
+    """Grava as quantidades mínimas com uma tabela temporária e um único UPDATE"""
+    cursor.execute("""
+        CREATE TEMPORARY TABLE tmp_reposicao (
+            id_variacao INT PRIMARY KEY,
+            quantidade_minima INT NOT NULL
+        )
+    """)
+    cursor.executemany("""
+        INSERT INTO tmp_reposicao (id_variacao, quantidade_minima) VALUES (%s, %s)
+    """, list(zip(ids_variacao.tolist(), pontos.tolist())))
+    cursor.execute(f"""
+        UPDATE {tabela} pv
+        INNER JOIN tmp_reposicao t ON pv.id_variacao = t.id_variacao
+        SET pv.quantidade_minima = t.quantidade_minima
+    """)
+    atualizadas = cursor.rowcount
+    cursor.execute('DROP TEMPORARY TABLE tmp_reposicao')
+    return atualizadas
+
+def medir(funcao, *args):
+    """Executa funcao e retorna (resultado, segundos, pico de memória em MB)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    tempo = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado, tempo, pico / 2**20
+
+@app.cli.command('reposicao')
+@click.option('--prazo', default=REPOSICAO_PRAZO_DIAS, show_default=True,
+              type=click.IntRange(min=1), help='Prazo de entrega do fornecedor em dias')
+def job_reposicao(prazo):
+    """Recalcula quantidade_minima dos SKUs a partir das vendas"""
+    inicio = time.perf_counter()
+    cursor = mysql.connection.cursor(MySQLdb.cursors.SSCursor)
+    (ids_variacao, colecao_idx, n_colecoes, novos,
+     sku_idx, semanas, quantidades) = carregar_vendas_colunares(cursor)
+    cursor.close()
+    
+    if len(ids_variacao) == 0:
+        click.echo('Nenhuma variação cadastrada')
+        return
+    
+    pontos, com_vendas = calcular_pontos_reposicao(sku_idx, semanas, quantidades,
+                                                   colecao_idx, n_colecoes, prazo)
+    
+    # SKUs novos ainda sem vendas mantêm a quantidade mínima atual; os que
+    # existiram durante toda a janela sem vender recebem o valor calculado
+    calculados = com_vendas | ~novos
+    cursor = mysql.connection.cursor(MySQLdb.cursors.Cursor)
+    atualizadas = atualizar_quantidades_minimas(cursor, ids_variacao[calculados], pontos[calculados])
+    mysql.connection.commit()
+    cursor.close()
+    
+    registrar_auditoria(None, 'UPDATE', 'produto_variacao', None,
+                        json.dumps({'reposicao': int(calculados.sum()), 'prazo_dias': prazo}))
+    
+    click.echo(f'{len(ids_variacao)} SKUs, {len(quantidades)} linhas de venda, '
+               f'{int(calculados.sum())} calculados, {atualizadas} atualizados '
+               f'em {time.perf_counter() - inicio:.2f}s')
+
+def _carregar_tabela_benchmark(cursor):
+    cursor.execute('SELECT id_variacao, semana, quantidade FROM tmp_bench_vendas')
+    return ler_colunas(cursor, 3)
+
+@app.cli.command('benchmark-reposicao')
+@click.option('--skus', multiple=True, type=int, default=[1000, 10000, 100000],
+              show_default=True, help='Tamanhos de catálogo a medir')
+@click.option('--linhas-por-sku', default=50, show_default=True,
+              help='Linhas de venda sintéticas por SKU')
+@click.option('--colecoes', default=20, show_default=True, help='Número de coleções')
+@click.option('--somente-calculo', is_flag=True,
+              help='Mede apenas o cálculo, sem acessar o banco')
+def benchmark_reposicao(skus, linhas_por_sku, colecoes, somente_calculo):
+    """Mede tempo e memória da carga, cálculo e gravação com dados sintéticos.
+
+    Carga e gravação usam tabelas temporárias da sessão (tmp_bench_*), sem
+    tocar em item_venda ou produto_variacao.
+    """
+    rng = np.random.default_rng(0)
+    click.echo(f'{"SKUs":>10} {"linhas":>12} '
+               f'{"carga (s)":>10} {"MB":>8} {"cálculo (s)":>12} {"MB":>8} {"gravação (s)":>13} {"MB":>8}')
+    
+    for n_skus in skus:
+        n_linhas = n_skus * linhas_por_sku
+        ids_variacao = np.arange(1, n_skus + 1)
+        colecao_idx = rng.integers(0, colecoes, n_skus)
+        sku_idx = rng.integers(0, n_skus, n_linhas)
+        semanas = rng.integers(0, REPOSICAO_SEMANAS_HISTORICO, n_linhas)
+        quantidades = rng.integers(1, 4, n_linhas)
+        carga = gravacao = (None, float('nan'), float('nan'))
+        
+        if not somente_calculo:
+            cursor = mysql.connection.cursor(MySQLdb.cursors.Cursor)
+            cursor.execute("""
+                CREATE TEMPORARY TABLE tmp_bench_vendas (
+                    id_variacao INT NOT NULL, semana INT NOT NULL, quantidade INT NOT NULL
+                )
+            """)
+            for i in range(0, n_linhas, REPOSICAO_LOTE_LEITURA):
+                fim = i + REPOSICAO_LOTE_LEITURA
+                cursor.executemany("""
+                    INSERT INTO tmp_bench_vendas (id_variacao, semana, quantidade) VALUES (%s, %s, %s)
+                """, list(zip(ids_variacao[sku_idx[i:fim]].tolist(), semanas[i:fim].tolist(),
+                              quantidades[i:fim].tolist())))
+            cursor.close()
+            
+            cursor = mysql.connection.cursor(MySQLdb.cursors.SSCursor)
+            carga = medir(_carregar_tabela_benchmark, cursor)
+            cursor.close()
+        
+        (pontos, _), tempo_calculo, pico_calculo = medir(
+            calcular_pontos_reposicao, sku_idx, semanas, quantidades, colecao_idx, colecoes)
+        
+        if not somente_calculo:
+            cursor = mysql.connection.cursor(MySQLdb.cursors.Cursor)
+            cursor.execute("""
+                CREATE TEMPORARY TABLE tmp_bench_variacao (
+                    id_variacao INT PRIMARY KEY, quantidade_minima INT DEFAULT 5
+                )
+            """)
+            cursor.executemany('INSERT INTO tmp_bench_variacao (id_variacao) VALUES (%s)',
+                               [(i,) for i in ids_variacao.tolist()])
+            gravacao = medir(atualizar_quantidades_minimas, cursor, ids_variacao, pontos,
+                             'tmp_bench_variacao')
+            cursor.execute('DROP TEMPORARY TABLE tmp_bench_vendas')
+            cursor.execute('DROP TEMPORARY TABLE tmp_bench_variacao')
+            mysql.connection.commit()
+            cursor.close()
+        
+        click.echo(f'{n_skus:>10} {n_linhas:>12} {carga[1]:>10.3f} {carga[2]:>8.1f} '
+                   f'{tempo_calculo:>12.3f} {pico_calculo:>8.1f} {gravacao[1]:>13.3f} {gravacao[2]:>8.1f}')
+
 # ============================================================
 # TRATAMENTO DE ERROS
 # ============================================================
@@ -687,4 +1170,7 @@ def erro_interno(error):
 # ============================================================
 
 if __name__ == '__main__':
+    # Com o reloader do modo debug, apenas o processo filho atende requisições
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        indice_clientes.iniciar()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
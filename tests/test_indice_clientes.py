@@ -0,0 +1,69 @@
+"""Testes do índice de busca de clientes (não acessam o banco)"""
+
+import pytest
+
+from app import IndiceClientes, normalizar_texto
+
+
+@pytest.fixture
+def indice():
+    indice = IndiceClientes()
+    for cliente in [
+        {'id_cliente': 1, 'nome': 'José Álvares Silva', 'cpf': '12345678901'},
+        {'id_cliente': 2, 'nome': 'Joana Silva', 'cpf': '12399999999'},
+        {'id_cliente': 3, 'nome': 'Silvana Costa', 'cpf': '98765432100'},
+    ]:
+        indice.adicionar(cliente)
+    return indice
+
+
+def ids(resultado):
+    return [cliente['id_cliente'] for cliente in resultado]
+
+
+def test_normalizar_texto():
+    assert normalizar_texto('  JOSÉ   Álvares ') == 'jose alvares'
+
+
+def test_busca_ignora_acentos_e_caixa(indice):
+    assert ids(indice.buscar('jose')) == [1]
+    assert ids(indice.buscar('ÁLVA')) == [1]
+
+
+def test_busca_cpf_com_pontuacao(indice):
+    assert ids(indice.buscar('123')) == [1, 2]
+    assert ids(indice.buscar('123.45')) == [1]
+    assert ids(indice.buscar('987.654.321-00')) == [3]
+
+
+def test_busca_por_sobrenome_apos_inicio_do_nome(indice):
+    # Início do nome tem prioridade sobre sobrenomes
+    assert ids(indice.buscar('sil')) == [3, 1, 2]
+    assert ids(indice.buscar('alvares s')) == [1]
+
+
+def test_busca_respeita_limite(indice):
+    assert ids(indice.buscar('sil', limite=2)) == [3, 1]
+    assert ids(indice.buscar('1', limite=1)) == [1]
+
+
+def test_busca_sem_termo(indice):
+    assert indice.buscar('') == []
+    assert indice.buscar('   ') == []
+
+
+def test_remover_retira_todas_as_chaves(indice):
+    indice.remover(1)
+    assert indice.buscar('jose') == []
+    assert indice.buscar('alvares') == []
+    assert ids(indice.buscar('silva')) == [3, 2]
+    assert ids(indice.buscar('123')) == [2]
+    assert (('jose alvares silva', 1) not in indice._nomes
+            and all(id_cliente != 1 for _, id_cliente in indice._sobrenomes + indice._cpfs))
+
+
+def test_adicionar_substitui_cliente_existente(indice):
+    indice.adicionar({'id_cliente': 1, 'nome': 'Maria Souza', 'cpf': '12345678901'})
+    assert indice.buscar('jose') == []
+    assert ids(indice.buscar('souza')) == [1]
+    assert ids(indice.buscar('12345')) == [1]
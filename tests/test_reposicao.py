@@ -0,0 +1,53 @@
+"""Testes do cálculo de pontos de reposição (não acessam o banco)"""
+
+import numpy as np
+import pytest
+
+from app import REPOSICAO_SAZONALIDADE_MAXIMA, REPOSICAO_SEMANAS_ANO, calcular_pontos_reposicao
+
+
+def vendas(*linhas):
+    """Converte tuplas (sku, semana, quantidade) em colunas"""
+    colunas = np.array(linhas, dtype=np.int64).reshape(-1, 3)
+    return colunas[:, 0], colunas[:, 1], colunas[:, 2]
+
+
+def test_sku_sem_vendas_fica_fora_da_mascara():
+    sku_idx, semanas, quantidades = vendas(*[(0, semana, 7) for semana in range(10)])
+    pontos, com_vendas = calcular_pontos_reposicao(sku_idx, semanas, quantidades,
+                                                   np.array([0, 0]), 1, prazo_dias=14)
+    assert com_vendas.tolist() == [True, False]
+    assert pontos[1] == 0
+
+
+def test_sazonalidade_neutra_sem_historico_do_ano_anterior():
+    # 7 por semana nas últimas 10 semanas: 1 por dia durante 14 dias
+    sku_idx, semanas, quantidades = vendas(*[(0, semana, 7) for semana in range(10)])
+    pontos, _ = calcular_pontos_reposicao(sku_idx, semanas, quantidades,
+                                          np.array([0]), 1, prazo_dias=14)
+    assert pontos.tolist() == [14]
+
+
+def test_sazonalidade_pela_razao_prazo_sobre_janela_no_ano_anterior():
+    ano = REPOSICAO_SEMANAS_ANO
+    linhas = [(0, semana, 7) for semana in range(8)]
+    # Ano anterior: 2/semana na janela da média, 3/semana nas semanas do prazo
+    linhas += [(0, ano + semana, 2) for semana in range(8)]
+    linhas += [(0, ano - 1, 3), (0, ano - 2, 3)]
+    pontos, _ = calcular_pontos_reposicao(*vendas(*linhas), np.array([0]), 1, prazo_dias=14)
+    assert pontos.tolist() == [21]  # 1/dia * 1.5 * 14
+
+
+def test_sazonalidade_limitada_ao_maximo():
+    ano = REPOSICAO_SEMANAS_ANO
+    linhas = [(0, semana, 7) for semana in range(8)]
+    linhas += [(0, ano + semana, 1) for semana in range(8)]
+    linhas += [(0, ano - 1, 10), (0, ano - 2, 10)]
+    pontos, _ = calcular_pontos_reposicao(*vendas(*linhas), np.array([0]), 1, prazo_dias=14)
+    assert pontos.tolist() == [14 * REPOSICAO_SAZONALIDADE_MAXIMA]
+
+
+@pytest.mark.parametrize('prazo', [0, -7])
+def test_prazo_invalido(prazo):
+    with pytest.raises(ValueError):
+        calcular_pontos_reposicao(*vendas((0, 0, 1)), np.array([0]), 1, prazo_dias=prazo)